@@ -1,10 +1,34 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterator, Optional
-import wandb
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterator, Optional
 
+from wandbctl.utils.config import hash_config
+from wandbctl.utils.serialization import dumps
 
-@dataclass
+# wandb takes about a second to import; only commands that talk to the
+# API should pay for it, so it is imported where a client is created.
+if TYPE_CHECKING:
+    import wandb
+
+
+def _coerce_dt(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        if value[-1] == "Z":
+            value = value[:-1] + "+00:00"
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+# Frozen so the cached JSON and hash cannot go stale after construction.
+@dataclass(frozen=True)
 class RunMetadata:
     id: str
     entity: str
@@ -18,8 +42,20 @@ class RunMetadata:
     summary: dict
     gpu_count: Optional[int]
     
+    @cached_property
+    def config_json(self) -> Optional[str]:
+        return dumps(self.config) if self.config else None
+    
+    @cached_property
+    def config_hash(self) -> Optional[str]:
+        return hash_config(self.config) if self.config else None
+    
+    @cached_property
+    def summary_json(self) -> Optional[str]:
+        return dumps(self.summary) if self.summary else None
+    
     @classmethod
-    def from_api_run(cls, run: wandb.apis.public.Run) -> "RunMetadata":
+    def from_api_run(cls, run: "wandb.apis.public.Run") -> "RunMetadata":
         config = dict(run.config) if run.config else {}
         summary = dict(run.summary) if run.summary else {}
         
@@ -29,31 +65,14 @@ class RunMetadata:
         elif "gpu_count" in config:
             gpu_count = config.get("gpu_count")
         
-        runtime = None
-        if hasattr(run, "runtime") and run.runtime is not None:
-            runtime = int(run.runtime)
+        runtime = getattr(run, "runtime", None)
+        if runtime is not None:
+            runtime = int(runtime)
         elif "_runtime" in summary:
             runtime = int(summary["_runtime"])
         
-        created = None
-        if hasattr(run, "created_at") and run.created_at:
-            if isinstance(run.created_at, str):
-                try:
-                    created = datetime.fromisoformat(run.created_at.replace("Z", "+00:00"))
-                except ValueError:
-                    pass
-            elif isinstance(run.created_at, datetime):
-                created = run.created_at
-        
-        updated = None
-        if hasattr(run, "updated_at") and run.updated_at:
-            if isinstance(run.updated_at, str):
-                try:
-                    updated = datetime.fromisoformat(run.updated_at.replace("Z", "+00:00"))
-                except ValueError:
-                    pass
-            elif isinstance(run.updated_at, datetime):
-                updated = run.updated_at
+        created = _coerce_dt(getattr(run, "created_at", None))
+        updated = _coerce_dt(getattr(run, "updated_at", None))
         
         return cls(
             id=run.id,
@@ -73,6 +92,8 @@ class RunMetadata:
 class WandbClient:
     
     def __init__(self):
+        import wandb
+        
         self._api = wandb.Api()
     
     @property
@@ -104,13 +125,27 @@ class WandbClient:
         
         path = f"{entity}/{project}" if project else entity
         
+        import wandb
+        
         try:
-            runs = self._api.runs(
-                path=path,
-                filters=filters or {},
-                order=order,
-                per_page=per_page,
-            )
+            try:
+                # Lazy runs fetch config and summary with one extra request
+                # per run; load them with each page instead.
+                runs = self._api.runs(
+                    path=path,
+                    filters=filters or {},
+                    order=order,
+                    per_page=per_page,
+                    lazy=False,
+                )
+            except TypeError:
+                # wandb releases without lazy loading always fetch full pages.
+                runs = self._api.runs(
+                    path=path,
+                    filters=filters or {},
+                    order=order,
+                    per_page=per_page,
+                )
             for run in runs:
                 try:
                     yield RunMetadata.from_api_run(run)
@@ -1,15 +1,46 @@
-import json
-from datetime import datetime, timezone
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import duckdb
 
 from wandbctl.api import RunMetadata
+from wandbctl.utils.config import hash_config
+from wandbctl.utils.serialization import dumps, loads
 
 
 DEFAULT_CACHE_PATH = Path.home() / ".wandbctl" / "cache.duckdb"
 
+DEFAULT_MEMORY_LIMIT = "2GB"
+MAX_THREADS = 8
+BULK_LOAD_CHECKPOINT_THRESHOLD = "1GB"
+SIZE_CACHE_TTL_SECONDS = 1.0
+# Runs carry their config/summary dicts; 1k per batch keeps peak memory a
+# few MB while per-batch load overhead stays negligible.
+UPSERT_CHUNK_SIZE = 1_000
+
+RUN_COLUMNS = (
+    "id", "entity", "project", "name", "state", "created_at", "updated_at",
+    "runtime_seconds", "config", "summary", "gpu_count", "synced_at",
+)
+
+LITE_RUN_COLUMNS = tuple(c for c in RUN_COLUMNS if c not in ("config", "summary"))
+
+TREND_BUCKET_FORMATS = {
+    "day": "%Y-%m-%d",
+    "week": "%Y-W%W",
+}
+
+TOP_RUN_ORDERS = {
+    "runtime": "COALESCE(runtime_seconds, 0)",
+    "gpu-hours": "COALESCE(runtime_seconds, 0) * COALESCE(NULLIF(gpu_count, 0), 1)",
+}
+
 SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS runs (
     id VARCHAR PRIMARY KEY,
@@ -23,13 +54,10 @@ CREATE TABLE IF NOT EXISTS runs (
     config JSON,
     summary JSON,
     gpu_count INTEGER,
-    synced_at TIMESTAMP NOT NULL
+    synced_at TIMESTAMP NOT NULL,
+    config_hash VARCHAR
 );
 
-CREATE INDEX IF NOT EXISTS idx_runs_entity_project ON runs(entity, project);
-CREATE INDEX IF NOT EXISTS idx_runs_state ON runs(state);
-CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at);
-
 CREATE SEQUENCE IF NOT EXISTS sync_log_seq;
 
 CREATE TABLE IF NOT EXISTS sync_log (
@@ -41,62 +69,369 @@ CREATE TABLE IF NOT EXISTS sync_log (
 );
 """
 
+INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_runs_entity_project ON runs(entity, project);
+CREATE INDEX IF NOT EXISTS idx_runs_state ON runs(state);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_config_hash ON runs(config_hash);
+"""
+
+DROP_INDEX_SQL = """
+DROP INDEX IF EXISTS idx_runs_entity_project;
+DROP INDEX IF EXISTS idx_runs_state;
+DROP INDEX IF EXISTS idx_runs_created;
+DROP INDEX IF EXISTS idx_runs_config_hash;
+"""
+
+UPSERT_BATCH_SQL = """
+INSERT OR REPLACE INTO runs
+(id, entity, project, name, state, created_at, updated_at,
+ runtime_seconds, config, summary, gpu_count, synced_at, config_hash)
+SELECT id, entity, project, name, state, created_at, updated_at,
+       runtime_seconds, config, summary, gpu_count, ? AS synced_at, config_hash
+FROM read_json(
+    ?,
+    format = 'newline_delimited',
+    maximum_object_size = 268435456,
+    columns = {
+        id: 'VARCHAR',
+        entity: 'VARCHAR',
+        project: 'VARCHAR',
+        name: 'VARCHAR',
+        state: 'VARCHAR',
+        created_at: 'TIMESTAMP',
+        updated_at: 'TIMESTAMP',
+        runtime_seconds: 'INTEGER',
+        config: 'JSON',
+        summary: 'JSON',
+        gpu_count: 'INTEGER',
+        config_hash: 'VARCHAR'
+    }
+)
+"""
+
+BACKFILL_CONFIG_HASH_SQL = """
+UPDATE runs SET config_hash = batch.config_hash
+FROM read_json(
+    ?,
+    format = 'newline_delimited',
+    columns = {id: 'VARCHAR', config_hash: 'VARCHAR'}
+) AS batch
+WHERE runs.id = batch.id
+"""
+
+
+def _to_utc_naive(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _batch_record(run: RunMetadata) -> dict:
+    created_at = _to_utc_naive(run.created_at)
+    updated_at = _to_utc_naive(run.updated_at)
+    return {
+        "id": run.id,
+        "entity": run.entity,
+        "project": run.project,
+        "name": run.name,
+        "state": run.state,
+        "created_at": created_at.isoformat() if created_at else None,
+        "updated_at": updated_at.isoformat() if updated_at else None,
+        "runtime_seconds": run.runtime_seconds,
+        "config": run.config or None,
+        "summary": run.summary or None,
+        "gpu_count": run.gpu_count,
+        "config_hash": run.config_hash,
+    }
+
+
+@contextmanager
+def _ndjson_batch(records: Iterable[dict]) -> Iterator[str]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        batch_path = Path(tmpdir) / "batch.ndjson"
+        with batch_path.open("w", encoding="utf-8") as f:
+            for record in records:
+                f.write(dumps(record))
+                f.write("\n")
+        yield str(batch_path)
+
+
+def _default_pragmas() -> dict[str, str]:
+    # Queries here are small and bursty; a handful of threads avoids
+    # spawning one worker per core for each of them.
+    return {
+        "threads": str(min(os.cpu_count() or 1, MAX_THREADS)),
+        "memory_limit": os.environ.get("WANDBCTL_DUCKDB_MEMORY_LIMIT", DEFAULT_MEMORY_LIMIT),
+    }
+
+
+def _run_columns(columns: Optional[tuple[str, ...]]) -> tuple[str, ...]:
+    columns = columns or LITE_RUN_COLUMNS
+    unknown = [c for c in columns if c not in RUN_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown run columns: {', '.join(unknown)}")
+    return columns
+
+
+def _run_filters(
+    entity: Optional[str] = None,
+    project: Optional[str] = None,
+    state: Optional[str] = None,
+    since: Optional[datetime] = None,
+    *,
+    states: Optional[Iterable[str]] = None,
+    max_runtime_seconds: Optional[int] = None,
+) -> tuple[list[str], list]:
+    conditions = []
+    params = []
+    
+    if entity:
+        conditions.append("entity = ?")
+        params.append(entity)
+    if project:
+        conditions.append("project = ?")
+        params.append(project)
+    if state:
+        conditions.append("state = ?")
+        params.append(state)
+    if states:
+        states = list(states)
+        conditions.append(f"state IN ({', '.join('?' for _ in states)})")
+        params.extend(states)
+    if since:
+        conditions.append("created_at >= ?")
+        params.append(since)
+    if max_runtime_seconds is not None:
+        conditions.append("runtime_seconds < ?")
+        params.append(max_runtime_seconds)
+    
+    return conditions, params
+
 
 class Cache:
     
-    def __init__(self, path: Optional[Path] = None):
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        read_only: bool = False,
+        pragmas: Optional[dict[str, str]] = None,
+    ):
         self.path = path or DEFAULT_CACHE_PATH
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = duckdb.connect(str(self.path))
-        self._init_schema()
+        self.read_only = read_only and self.path.exists()
+        self.pragmas = {**_default_pragmas(), **(pragmas or {})}
+        self._in_transaction = False
+        self._size_cache: Optional[tuple[float, int]] = None
+        self._connect()
+        
+        if self.read_only and not self._has_current_schema():
+            # Caches written by older versions need a one-time writable
+            # migration before they can be read.
+            self._conn.close()
+            self.read_only = False
+            self._connect()
+        
+        if not self.read_only:
+            self._init_schema()
+    
+    def _connect(self) -> None:
+        self._conn = duckdb.connect(
+            str(self.path),
+            read_only=self.read_only,
+            config=self.pragmas,
+        )
+        self._configure_session(self._conn)
+    
+    @staticmethod
+    def _configure_session(conn: duckdb.DuckDBPyConnection) -> None:
+        # Timestamps are stored as naive UTC; pin the session time zone so
+        # timezone-aware parameters are converted to UTC rather than local time.
+        conn.execute("SET TimeZone = 'UTC'")
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        if self._in_transaction:
+            yield
+            return
+        
+        self._conn.execute("BEGIN TRANSACTION")
+        self._in_transaction = True
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        else:
+            self._conn.execute("COMMIT")
+        finally:
+            self._in_transaction = False
     
     def _init_schema(self):
-        for statement in SCHEMA_SQL.strip().split(";"):
-            statement = statement.strip()
-            if statement:
-                self._conn.execute(statement)
+        self._init_tables()
+        self._ensure_indexes()
+    
+    def _init_tables(self) -> None:
+        self._conn.execute(SCHEMA_SQL)
+        self._migrate()
+    
+    def _ensure_indexes(self) -> None:
+        self._conn.execute(INDEX_SQL)
+    
+    def _has_current_schema(self) -> bool:
+        result = self._conn.execute(
+            """
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_name = 'runs' AND column_name = 'config_hash'
+            """
+        ).fetchone()
+        return bool(result[0])
+    
+    def _migrate(self) -> None:
+        if not self._has_current_schema():
+            with self._transaction():
+                self._conn.execute("ALTER TABLE runs ADD COLUMN config_hash VARCHAR")
+                self._backfill_config_hashes()
+    
+    def _backfill_config_hashes(self) -> None:
+        rows = self._conn.execute(
+            "SELECT id, config FROM runs WHERE config IS NOT NULL"
+        ).fetchall()
+        if not rows:
+            return
+        
+        records = (
+            {"id": run_id, "config_hash": hash_config(loads(config))}
+            for run_id, config in rows
+        )
+        with _ndjson_batch(records) as batch_path:
+            self._conn.execute(BACKFILL_CONFIG_HASH_SQL, [batch_path])
     
     def close(self):
         self._conn.close()
     
-    def upsert_run(self, run: RunMetadata) -> None:
-        now = datetime.now(timezone.utc)
+    def __enter__(self) -> "Cache":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def _fetch_dicts(self, sql: str, params: list) -> list[dict]:
+        cursor = self._conn.execute(sql, params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        # Secondary indexes are maintained row by row on insert; dropping them
+        # for the duration of a large load and rebuilding once is much cheaper.
+        # Checkpointing is deferred as well, so the load is written out once.
+        threshold = self._conn.execute(
+            "SELECT current_setting('checkpoint_threshold')"
+        ).fetchone()[0]
+        self._conn.execute(DROP_INDEX_SQL)
         self._conn.execute(
-            """
-            INSERT OR REPLACE INTO runs 
-            (id, entity, project, name, state, created_at, updated_at, 
-             runtime_seconds, config, summary, gpu_count, synced_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            [
-                run.id,
-                run.entity,
-                run.project,
-                run.name,
-                run.state,
-                run.created_at,
-                run.updated_at,
-                run.runtime_seconds,
-                json.dumps(run.config) if run.config else None,
-                json.dumps(run.summary) if run.summary else None,
-                run.gpu_count,
-                now,
-            ]
+            f"SET checkpoint_threshold = '{BULK_LOAD_CHECKPOINT_THRESHOLD}'"
         )
+        try:
+            yield
+        finally:
+            self._conn.execute(f"SET checkpoint_threshold = '{threshold}'")
+            self._ensure_indexes()
     
-    def upsert_runs(self, runs: list[RunMetadata]) -> int:
+    def upsert_run(self, run: RunMetadata) -> None:
+        now = datetime.now(timezone.utc)
+        with self._transaction():
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO runs 
+                (id, entity, project, name, state, created_at, updated_at, 
+                 runtime_seconds, config, summary, gpu_count, synced_at, config_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    run.id,
+                    run.entity,
+                    run.project,
+                    run.name,
+                    run.state,
+                    run.created_at,
+                    run.updated_at,
+                    run.runtime_seconds,
+                    run.config_json,
+                    run.summary_json,
+                    run.gpu_count,
+                    now,
+                    run.config_hash,
+                ]
+            )
+    
+    def upsert_runs(self, runs: Iterable[RunMetadata]) -> int:
+        # Stage the batch as NDJSON and load it with DuckDB's native reader:
+        # one vectorized INSERT instead of a prepared statement per row.
+        # Rows are ordered by primary key so the PK index is probed
+        # sequentially; unsorted upserts degrade badly on large tables.
+        unique_runs = sorted({run.id: run for run in runs}.values(), key=lambda r: r.id)
+        if not unique_runs:
+            return 0
+        
+        now = _to_utc_naive(datetime.now(timezone.utc))
+        records = (_batch_record(run) for run in unique_runs)
+        with _ndjson_batch(records) as batch_path, self._transaction():
+            self._conn.execute(UPSERT_BATCH_SQL, [now, batch_path])
+        
+        return len(unique_runs)
+    
+    def upsert_runs_chunked(
+        self,
+        runs: Iterable[RunMetadata],
+        chunk_size: int = UPSERT_CHUNK_SIZE,
+    ) -> int:
         count = 0
-        for run in runs:
-            self.upsert_run(run)
-            count += 1
+        batch = []
+        with self._transaction():
+            for run in runs:
+                batch.append(run)
+                if len(batch) >= chunk_size:
+                    count += self.upsert_runs(batch)
+                    batch.clear()
+            if batch:
+                count += self.upsert_runs(batch)
         return count
     
-    def delete_runs_before(self, cutoff: datetime) -> int:
+    def load_runs(self, runs: Iterable[RunMetadata]) -> int:
+        # Rebuilding the indexes scans the whole table, which only pays off
+        # when more than one chunk is coming in; small incremental syncs keep
+        # the indexes and update them row by row.
+        runs = iter(runs)
+        head = list(islice(runs, UPSERT_CHUNK_SIZE + 1))
+        if len(head) <= UPSERT_CHUNK_SIZE:
+            return self.upsert_runs_chunked(head)
+        
+        with self.bulk_load():
+            return self.upsert_runs_chunked(chain(head, runs))
+    
+    def count_runs_before(self, cutoff: datetime) -> int:
         result = self._conn.execute(
             "SELECT COUNT(*) FROM runs WHERE created_at < ?",
             [cutoff]
         ).fetchone()
-        count = result[0] if result else 0
+        return result[0] if result else 0
+    
+    def sample_runs_before(self, cutoff: datetime, limit: int = 10) -> list[tuple[str, str]]:
+        return self._conn.execute(
+            """
+            SELECT id, project FROM runs
+            WHERE created_at < ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            [cutoff, limit]
+        ).fetchall()
+    
+    def delete_runs_before(self, cutoff: datetime) -> int:
+        count = self.count_runs_before(cutoff)
         
         self._conn.execute(
             "DELETE FROM runs WHERE created_at < ?",
@@ -124,26 +459,15 @@ class Cache:
         entity: Optional[str] = None,
         project: Optional[str] = None,
     ) -> Optional[datetime]:
-        if entity and project:
-            result = self._conn.execute(
-                """
-                SELECT MAX(synced_at) FROM sync_log
-                WHERE entity = ? AND project = ?
-                """,
-                [entity, project]
-            ).fetchone()
-        elif entity:
-            result = self._conn.execute(
-                """
-                SELECT MAX(synced_at) FROM sync_log
-                WHERE entity = ?
-                """,
-                [entity]
-            ).fetchone()
-        else:
-            result = self._conn.execute(
-                "SELECT MAX(synced_at) FROM sync_log"
-            ).fetchone()
+        entity = entity or None
+        project = project or None
+        result = self._conn.execute(
+            """
+            SELECT MAX(synced_at) FROM sync_log
+            WHERE (? IS NULL OR entity = ?) AND (? IS NULL OR project = ?)
+            """,
+            [entity, entity, project, project]
+        ).fetchone()
         
         return result[0] if result and result[0] else None
     
@@ -151,28 +475,53 @@ class Cache:
         self,
         entity: Optional[str] = None,
         project: Optional[str] = None,
+        state: Optional[str] = None,
     ) -> int:
-        if entity and project:
-            result = self._conn.execute(
-                "SELECT COUNT(*) FROM runs WHERE entity = ? AND project = ?",
-                [entity, project]
-            ).fetchone()
-        elif entity:
-            result = self._conn.execute(
-                "SELECT COUNT(*) FROM runs WHERE entity = ?",
-                [entity]
-            ).fetchone()
-        else:
-            result = self._conn.execute(
-                "SELECT COUNT(*) FROM runs"
-            ).fetchone()
+        entity = entity or None
+        project = project or None
+        state = state or None
+        result = self._conn.execute(
+            """
+            SELECT COUNT(*) FROM runs
+            WHERE (? IS NULL OR entity = ?) AND (? IS NULL OR project = ?)
+              AND (? IS NULL OR state = ?)
+            """,
+            [entity, entity, project, project, state, state]
+        ).fetchone()
         
         return result[0] if result else 0
     
     def get_cache_size_bytes(self) -> int:
-        if self.path.exists():
-            return self.path.stat().st_size
-        return 0
+        now = time.monotonic()
+        if self._size_cache and now - self._size_cache[0] < SIZE_CACHE_TTL_SECONDS:
+            return self._size_cache[1]
+        
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        self._size_cache = (now, size)
+        return size
+    
+    def _runs_query(
+        self,
+        entity: Optional[str],
+        project: Optional[str],
+        state: Optional[str],
+        since: Optional[datetime],
+        columns: Optional[tuple[str, ...]],
+    ) -> tuple[str, list]:
+        columns = _run_columns(columns)
+        conditions, params = _run_filters(entity, project, state, since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        sql = f"""
+            SELECT {', '.join(columns)}
+            FROM runs
+            {where}
+            ORDER BY created_at DESC
+            """
+        return sql, params
     
     def query_runs(
         self,
@@ -180,61 +529,107 @@ class Cache:
         project: Optional[str] = None,
         state: Optional[str] = None,
         since: Optional[datetime] = None,
+        columns: Optional[tuple[str, ...]] = None,
     ) -> list[dict]:
-        conditions = []
-        params = []
-        
-        if entity:
-            conditions.append("entity = ?")
-            params.append(entity)
-        if project:
-            conditions.append("project = ?")
-            params.append(project)
-        if state:
-            conditions.append("state = ?")
-            params.append(state)
-        if since:
-            conditions.append("created_at >= ?")
-            params.append(since)
+        sql, params = self._runs_query(entity, project, state, since, columns)
+        return self._fetch_dicts(sql, params)
+    
+    def iter_runs(
+        self,
+        entity: Optional[str] = None,
+        project: Optional[str] = None,
+        state: Optional[str] = None,
+        since: Optional[datetime] = None,
+        columns: Optional[tuple[str, ...]] = None,
+        *,
+        batch_size: int = 1024,
+    ) -> Iterator[dict]:
+        sql, params = self._runs_query(entity, project, state, since, columns)
+        # A separate cursor keeps the stream valid if the connection is
+        # queried again while the caller is still consuming rows.
+        cursor = self._conn.cursor()
+        try:
+            self._configure_session(cursor)
+            cursor.execute(sql, params)
+            names = [col[0] for col in cursor.description]
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield dict(zip(names, row))
+        finally:
+            cursor.close()
+    
+    def query_top_runs(
+        self,
+        entity: Optional[str] = None,
+        project: Optional[str] = None,
+        state: Optional[str] = None,
+        by: str = "runtime",
+        limit: int = 10,
+        columns: Optional[tuple[str, ...]] = None,
+    ) -> list[dict]:
+        if by not in TOP_RUN_ORDERS:
+            raise ValueError(f"Unknown sort key: {by}")
+        columns = _run_columns(columns)
         
+        conditions, params = _run_filters(entity, project, state)
         where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         
-        result = self._conn.execute(
+        return self._fetch_dicts(
             f"""
-            SELECT id, entity, project, name, state, created_at, updated_at,
-                   runtime_seconds, config, summary, gpu_count, synced_at
+            SELECT {', '.join(columns)}
             FROM runs
             {where}
-            ORDER BY created_at DESC
+            ORDER BY {TOP_RUN_ORDERS[by]} DESC, created_at DESC, id
+            LIMIT ?
             """,
-            params
-        ).fetchall()
+            params + [limit]
+        )
+    
+    def get_runs_by_ids(
+        self,
+        run_ids: list[str],
+        entity: Optional[str] = None,
+        project: Optional[str] = None,
+    ) -> dict[str, dict]:
+        if not run_ids:
+            return {}
         
-        columns = [
-            "id", "entity", "project", "name", "state", "created_at", "updated_at",
-            "runtime_seconds", "config", "summary", "gpu_count", "synced_at"
-        ]
-        return [dict(zip(columns, row)) for row in result]
-
+        conditions, params = _run_filters(entity, project)
+        scope = "".join(f" AND {c}" for c in conditions)
+        select = f"SELECT {', '.join(RUN_COLUMNS)} FROM runs"
+        
+        placeholders = ", ".join("?" for _ in run_ids)
+        found = {
+            run["id"]: run
+            for run in self._fetch_dicts(
+                f"{select} WHERE id IN ({placeholders}){scope}",
+                list(run_ids) + params
+            )
+        }
+        matched = {run_id: found[run_id] for run_id in run_ids if run_id in found}
+        
+        prefixes = [run_id for run_id in run_ids if run_id not in matched]
+        if prefixes:
+            prefix_match = " OR ".join("starts_with(id, ?)" for _ in prefixes)
+            candidates = self._fetch_dicts(
+                f"{select} WHERE ({prefix_match}){scope} ORDER BY created_at DESC",
+                prefixes + params
+            )
+            for prefix in prefixes:
+                for run in candidates:
+                    if run["id"].startswith(prefix):
+                        matched[prefix] = run
+                        break
+        
+        return matched
+    
     def get_usage_stats(
         self,
         entity: Optional[str] = None,
         project: Optional[str] = None,
         since: Optional[datetime] = None,
     ) -> dict:
-        conditions = []
-        params = []
-        
-        if entity:
-            conditions.append("entity = ?")
-            params.append(entity)
-        if project:
-            conditions.append("project = ?")
-            params.append(project)
-        if since:
-            conditions.append("created_at >= ?")
-            params.append(since)
-        
+        conditions, params = _run_filters(entity, project, since=since)
         where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         
         result = self._conn.execute(
@@ -265,6 +660,181 @@ class Cache:
             "project_count": result[7] or 0,
         }
     
+    def get_cost_breakdown(
+        self,
+        entity: Optional[str] = None,
+        project: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> list[dict]:
+        conditions, params = _run_filters(entity, project, since=since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        return self._fetch_dicts(
+            f"""
+            SELECT
+                project,
+                COUNT(*) as runs,
+                SUM(COALESCE(runtime_seconds, 0)) as runtime_seconds,
+                SUM(COALESCE(runtime_seconds, 0) * COALESCE(NULLIF(gpu_count, 0), 1)) as gpu_seconds
+            FROM runs
+            {where}
+            GROUP BY project
+            ORDER BY gpu_seconds DESC, project
+            """,
+            params
+        )
+    
+    def get_avg_finished_runtime(
+        self,
+        entity: Optional[str] = None,
+        project: Optional[str] = None,
+    ) -> Optional[float]:
+        conditions, params = _run_filters(entity, project, state="finished")
+        result = self._conn.execute(
+            f"SELECT AVG(runtime_seconds) FROM runs WHERE {' AND '.join(conditions)}",
+            params
+        ).fetchone()
+        return result[0] if result else None
+    
+    def count_early_failures(
+        self,
+        entity: Optional[str] = None,
+        project: Optional[str] = None,
+        max_runtime_seconds: int = 300,
+    ) -> int:
+        conditions, params = _run_filters(
+            entity,
+            project,
+            states=("failed", "crashed"),
+            max_runtime_seconds=max_runtime_seconds,
+        )
+        result = self._conn.execute(
+            f"SELECT COUNT(*) FROM runs WHERE {' AND '.join(conditions)}",
+            params
+        ).fetchone()
+        return result[0] if result else 0
+    
+    def get_failure_breakdown(
+        self,
+        entity: Optional[str] = None,
+        project: Optional[str] = None,
+        since: Optional[datetime] = None,
+        top_projects: int = 5,
+    ) -> dict:
+        conditions, params = _run_filters(entity, project, since=since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        failed = "state IN ('failed', 'crashed')"
+        
+        result = self._conn.execute(
+            f"""
+            SELECT
+                COUNT(*) as total_runs,
+                SUM(CASE WHEN {failed} THEN 1 ELSE 0 END) as failed_runs,
+                SUM(CASE WHEN {failed} AND COALESCE(runtime_seconds, 0) < 300 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN {failed} AND COALESCE(runtime_seconds, 0) BETWEEN 300 AND 3599 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN {failed} AND COALESCE(runtime_seconds, 0) >= 3600 THEN 1 ELSE 0 END)
+            FROM runs
+            {where}
+            """,
+            params
+        ).fetchone()
+        
+        by_project = self._conn.execute(
+            f"""
+            SELECT project, COUNT(*) as failures
+            FROM runs
+            WHERE {' AND '.join(conditions + [failed])}
+            GROUP BY project
+            ORDER BY failures DESC, project
+            LIMIT ?
+            """,
+            params + [top_projects]
+        ).fetchall()
+        
+        return {
+            "total_runs": result[0] or 0,
+            "failed_runs": result[1] or 0,
+            "early_failures": result[2] or 0,
+            "medium_failures": result[3] or 0,
+            "late_failures": result[4] or 0,
+            "by_project": by_project,
+        }
+    
+    def get_run_trends(
+        self,
+        entity: Optional[str] = None,
+        project: Optional[str] = None,
+        since: Optional[datetime] = None,
+        group: str = "day",
+        dense: bool = False,
+    ) -> list[dict]:
+        if group not in TREND_BUCKET_FORMATS:
+            raise ValueError(f"Unknown trend grouping: {group}")
+        if dense and since is None:
+            raise ValueError("Dense trends need a start time")
+        
+        bucket_format = TREND_BUCKET_FORMATS[group]
+        conditions, params = _run_filters(entity, project, since=since)
+        conditions.append("created_at IS NOT NULL")
+        totals_sql = f"""
+            SELECT
+                strftime(created_at, ?) as bucket,
+                COUNT(*) as runs,
+                SUM(COALESCE(runtime_seconds, 0)) as runtime_seconds
+            FROM runs
+            WHERE {' AND '.join(conditions)}
+            GROUP BY bucket
+            """
+        
+        if not dense:
+            return self._fetch_dicts(
+                f"{totals_sql} ORDER BY bucket",
+                [bucket_format] + params
+            )
+        
+        # Every bucket from the start date through today, including empty ones.
+        start = _to_utc_naive(since).date()
+        today = datetime.now(timezone.utc).date()
+        return self._fetch_dicts(
+            f"""
+            WITH buckets AS (
+                SELECT DISTINCT strftime(day, ?) as bucket
+                FROM generate_series(CAST(? AS DATE), CAST(? AS DATE), INTERVAL 1 DAY) AS t(day)
+            ),
+            totals AS ({totals_sql})
+            SELECT
+                buckets.bucket,
+                COALESCE(totals.runs, 0) as runs,
+                COALESCE(totals.runtime_seconds, 0) as runtime_seconds
+            FROM buckets
+            LEFT JOIN totals ON totals.bucket = buckets.bucket
+            ORDER BY buckets.bucket
+            """,
+            [bucket_format, start, today, bucket_format] + params
+        )
+    
+    def get_project_stats(self, entity: Optional[str] = None) -> list[dict]:
+        conditions, params = _run_filters(entity)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        return self._fetch_dicts(
+            f"""
+            SELECT
+                project,
+                COUNT(*) as runs,
+                SUM(CASE WHEN state = 'finished' THEN 1 ELSE 0 END) as finished,
+                SUM(CASE WHEN state IN ('failed', 'crashed') THEN 1 ELSE 0 END) as failed,
+                SUM(CASE WHEN state = 'running' THEN 1 ELSE 0 END) as running,
+                SUM(COALESCE(runtime_seconds, 0)) as runtime_seconds,
+                SUM(COALESCE(runtime_seconds, 0) * COALESCE(NULLIF(gpu_count, 0), 1)) / 3600.0 as gpu_hours
+            FROM runs
+            {where}
+            GROUP BY project
+            ORDER BY runs DESC, project
+            """,
+            params
+        )
+    
     def get_running_runs(
         self,
         entity: Optional[str] = None,
@@ -278,20 +848,16 @@ class Cache:
         entity: Optional[str] = None,
         project: Optional[str] = None,
         limit: int = 10,
+        within: Optional[timedelta] = None,
     ) -> list[dict]:
-        conditions = ["config IS NOT NULL"]
-        params = []
-        
-        if entity:
-            conditions.append("entity = ?")
-            params.append(entity)
-        if project:
-            conditions.append("project = ?")
-            params.append(project)
+        since = datetime.now(timezone.utc) - within if within else None
+        conditions, params = _run_filters(entity, project, since=since)
+        conditions.insert(0, "config_hash = ?")
+        params.insert(0, config_hash)
         
         where = f"WHERE {' AND '.join(conditions)}"
         
-        result = self._conn.execute(
+        return self._fetch_dicts(
             f"""
             SELECT id, entity, project, name, state, created_at, runtime_seconds, config
             FROM runs
@@ -299,24 +865,5 @@ class Cache:
             ORDER BY created_at DESC
             LIMIT ?
             """,
-            params + [limit * 10]
-        ).fetchall()
-        
-        columns = ["id", "entity", "project", "name", "state", "created_at", "runtime_seconds", "config"]
-        matches = []
-        for row in result:
-            run_dict = dict(zip(columns, row))
-            if run_dict.get("config"):
-                import hashlib
-                run_config = run_dict["config"]
-                if isinstance(run_config, str):
-                    run_config = json.loads(run_config)
-                run_hash = hashlib.sha256(
-                    json.dumps(run_config, sort_keys=True).encode()
-                ).hexdigest()[:16]
-                if run_hash == config_hash:
-                    matches.append(run_dict)
-                    if len(matches) >= limit:
-                        break
-        
-        return matches
+            params + [limit]
+        )
@@ -24,47 +24,33 @@ from wandbctl.utils.display import (
 @click.option("--force", is_flag=True, help="Skip confirmation prompt")
 def clean(days: int, dry_run: bool, force: bool):
     try:
-        cache = Cache()
-        
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        
-        runs = cache.query_runs()
-        old_runs = []
-        for run in runs:
-            created = run.get("created_at")
-            if created:
-                if created.tzinfo is None:
-                    created = created.replace(tzinfo=timezone.utc)
-                if created < cutoff:
-                    old_runs.append(run)
-        
-        if not old_runs:
-            print_success(f"No runs older than {days} days found")
-            cache.close()
-            return
-        
-        print_info(f"Found {len(old_runs)} runs older than {days} days")
-        
-        if dry_run:
-            console.print("\n[dim]Dry run - no changes made[/dim]")
-            for run in old_runs[:10]:
-                console.print(f"  Would delete: {run['id'][:8]} ({run['project']})")
-            if len(old_runs) > 10:
-                console.print(f"  ... and {len(old_runs) - 10} more")
-            cache.close()
-            return
-        
-        if not force:
-            print_warning(f"This will delete {len(old_runs)} runs from the cache")
-            if not click.confirm("Continue?"):
-                print_info("Aborted")
-                cache.close()
+        with Cache(read_only=dry_run) as cache:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+            
+            old_count = cache.count_runs_before(cutoff)
+            
+            if old_count == 0:
+                print_success(f"No runs older than {days} days found")
                 return
-        
-        deleted = cache.delete_runs_before(cutoff)
-        print_success(f"Deleted {deleted} runs from cache")
-        
-        cache.close()
+            
+            print_info(f"Found {old_count} runs older than {days} days")
+            
+            if dry_run:
+                console.print("\n[dim]Dry run - no changes made[/dim]")
+                for run_id, run_project in cache.sample_runs_before(cutoff, limit=10):
+                    console.print(f"  Would delete: {run_id[:8]} ({run_project})")
+                if old_count > 10:
+                    console.print(f"  ... and {old_count - 10} more")
+                return
+            
+            if not force:
+                print_warning(f"This will delete {old_count} runs from the cache")
+                if not click.confirm("Continue?"):
+                    print_info("Aborted")
+                    return
+            
+            deleted = cache.delete_runs_before(cutoff)
+            print_success(f"Deleted {deleted} runs from cache")
         
     except SystemExit:
         raise
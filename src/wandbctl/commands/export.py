@@ -1,17 +1,69 @@
-import json
-from datetime import datetime, timedelta, timezone
-from pathlib import Path
+import itertools
+import sys
+from typing import BinaryIO, Iterable
 
 import click
 
 from wandbctl.cache import Cache
 from wandbctl.utils.display import (
-    console,
     print_error,
     print_info,
     print_success,
     print_data_source,
 )
+from wandbctl.utils.duration import parse_since
+from wandbctl.utils.serialization import dumps_bytes, loads, raw_json
+
+
+EXPORT_COLUMNS = (
+    "id", "entity", "project", "name", "state", "runtime_seconds",
+    "gpu_count", "created_at", "config", "summary",
+)
+
+
+def _export_record(run: dict, raw_config: bool = False) -> dict:
+    # Rows arrive as fresh dicts in EXPORT_COLUMNS order, so they are
+    # trimmed in place rather than copied into a new record.
+    if not run["created_at"]:
+        del run["created_at"]
+    
+    cfg = run["config"]
+    if not cfg:
+        del run["config"]
+    elif isinstance(cfg, str):
+        run["config"] = raw_json(cfg) if raw_config else loads(cfg)
+    
+    summary = run["summary"]
+    if not summary:
+        del run["summary"]
+    else:
+        if isinstance(summary, str):
+            summary = loads(summary)
+        run["summary"] = {k: v for k, v in summary.items() if not k.startswith("_")}
+    
+    return run
+
+
+def write_json_array(out: BinaryIO, records: Iterable[dict], pretty: bool = False) -> int:
+    count = 0
+    out.write(b"[")
+    for record in records:
+        encoded = dumps_bytes(record, indent=pretty)
+        if pretty:
+            encoded = b"\n  " + encoded.replace(b"\n", b"\n  ")
+        out.write(b"," + encoded if count else encoded)
+        count += 1
+    out.write(b"\n]\n" if pretty and count else b"]\n")
+    return count
+
+
+def write_ndjson(out: BinaryIO, records: Iterable[dict]) -> int:
+    count = 0
+    for record in records:
+        out.write(dumps_bytes(record))
+        out.write(b"\n")
+        count += 1
+    return count
 
 
 @click.command()
@@ -29,6 +81,16 @@ from wandbctl.utils.display import (
     help="Output file path (default: stdout)"
 )
 @click.option("--pretty", is_flag=True, help="Pretty print JSON output")
+@click.option(
+    "--ndjson",
+    is_flag=True,
+    help="Write one JSON object per line instead of an array (ignores --pretty)"
+)
+@click.option(
+    "--raw-config",
+    is_flag=True,
+    help="Copy cached config JSON verbatim instead of re-encoding it (faster; not re-indented by --pretty)"
+)
 def export(
     entity: str | None,
     project: str | None,
@@ -36,81 +98,54 @@ def export(
     duration: str | None,
     output: str | None,
     pretty: bool,
+    ndjson: bool,
+    raw_config: bool,
 ):
     try:
-        cache = Cache()
-        
-        run_count = cache.get_run_count(entity=entity, project=project)
-        if run_count == 0:
-            print_info("No cached runs. Run 'wandbctl sync' first.")
-            cache.close()
-            raise SystemExit(0)
-        
-        since = None
-        if duration:
-            import re
-            match = re.match(r"^(\d+)([dw])$", duration.lower())
-            if not match:
-                print_error(f"Invalid duration format: {duration}")
-                cache.close()
+        with Cache(read_only=True) as cache:
+            run_count = cache.get_run_count(entity=entity, project=project)
+            if run_count == 0:
+                print_info("No cached runs. Run 'wandbctl sync' first.")
+                raise SystemExit(0)
+            
+            try:
+                since = parse_since(duration, units="dw")
+            except ValueError as e:
+                print_error(str(e))
                 raise SystemExit(1)
             
-            value = int(match.group(1))
-            unit = match.group(2)
-            if unit == "d":
-                delta = timedelta(days=value)
-            else:
-                delta = timedelta(weeks=value)
-            since = datetime.now(timezone.utc) - delta
-        
-        runs = cache.query_runs(entity=entity, project=project, state=state, since=since)
-        
-        if not runs:
-            print_info("No runs found matching criteria")
-            cache.close()
-            return
-        
-        export_data = []
-        for run in runs:
-            run_export = {
-                "id": run["id"],
-                "entity": run["entity"],
-                "project": run["project"],
-                "name": run["name"],
-                "state": run["state"],
-                "runtime_seconds": run["runtime_seconds"],
-                "gpu_count": run["gpu_count"],
-            }
+            runs = cache.iter_runs(
+                entity=entity,
+                project=project,
+                state=state,
+                since=since,
+                columns=EXPORT_COLUMNS,
+            )
             
-            if run.get("created_at"):
-                run_export["created_at"] = run["created_at"].isoformat() if hasattr(run["created_at"], 'isoformat') else str(run["created_at"])
+            first = next(runs, None)
+            if first is None:
+                print_info("No runs found matching criteria")
+                return
             
-            if run.get("config"):
-                cfg = run["config"]
-                if isinstance(cfg, str):
-                    cfg = json.loads(cfg)
-                run_export["config"] = cfg
+            records = (
+                _export_record(run, raw_config=raw_config)
+                for run in itertools.chain([first], runs)
+            )
             
-            if run.get("summary"):
-                summary = run["summary"]
-                if isinstance(summary, str):
-                    summary = json.loads(summary)
-                run_export["summary"] = {k: v for k, v in summary.items() if not k.startswith("_")}
+            out = open(output, "wb") if output else sys.stdout.buffer
+            try:
+                if ndjson:
+                    exported = write_ndjson(out, records)
+                else:
+                    exported = write_json_array(out, records, pretty=pretty)
+            finally:
+                if output:
+                    out.close()
+                else:
+                    out.flush()
             
-            export_data.append(run_export)
-        
-        if pretty:
-            json_output = json.dumps(export_data, indent=2, default=str)
-        else:
-            json_output = json.dumps(export_data, default=str)
-        
-        if output:
-            Path(output).write_text(json_output)
-            print_success(f"Exported {len(export_data)} runs to {output}")
-        else:
-            console.print(json_output)
-        
-        cache.close()
+            if output:
+                print_success(f"Exported {exported} runs to {output}")
         
     except SystemExit:
         raise
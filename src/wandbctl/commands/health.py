@@ -30,19 +30,17 @@ def health():
             checks.append(("W&B Auth", False, str(e)))
         
         try:
-            cache = Cache()
-            run_count = cache.get_run_count()
-            cache_size = cache.get_cache_size_bytes()
-            last_sync = cache.get_last_sync()
-            
-            checks.append(("Cache", True, f"{run_count} runs, {format_bytes(cache_size)}"))
-            
-            if last_sync:
-                checks.append(("Last Sync", True, format_time_ago(last_sync)))
-            else:
-                checks.append(("Last Sync", False, "Never synced"))
-            
-            cache.close()
+            with Cache(read_only=True) as cache:
+                run_count = cache.get_run_count()
+                cache_size = cache.get_cache_size_bytes()
+                last_sync = cache.get_last_sync()
+                
+                checks.append(("Cache", True, f"{run_count} runs, {format_bytes(cache_size)}"))
+                
+                if last_sync:
+                    checks.append(("Last Sync", True, format_time_ago(last_sync)))
+                else:
+                    checks.append(("Last Sync", False, "Never synced"))
         except Exception as e:
             checks.append(("Cache", False, str(e)))
         
@@ -1,5 +1,5 @@
 import sys
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 from pathlib import Path
 
 import click
@@ -67,30 +67,20 @@ def preflight(
     print_info(f"Config hash: {config_hash}")
     
     try:
-        cache = Cache()
-        run_count = cache.get_run_count(entity=entity, project=project)
-        
-        if run_count > 0:
-            console.print()
-            print_info("Checking for duplicate runs...")
-            
-            matches = cache.get_config_hash_matches(
-                config_hash=config_hash,
-                entity=entity,
-                project=project,
-                limit=5,
-            )
+        with Cache(read_only=True) as cache:
+            run_count = cache.get_run_count(entity=entity, project=project)
             
-            if matches:
-                recent_24h = []
-                now = datetime.now(timezone.utc)
-                for m in matches:
-                    created = m.get("created_at")
-                    if created:
-                        if created.tzinfo is None:
-                            created = created.replace(tzinfo=timezone.utc)
-                        if (now - created) < timedelta(hours=24):
-                            recent_24h.append(m)
+            if run_count > 0:
+                console.print()
+                print_info("Checking for duplicate runs...")
+                
+                recent_24h = cache.get_config_hash_matches(
+                    config_hash=config_hash,
+                    entity=entity,
+                    project=project,
+                    limit=5,
+                    within=timedelta(hours=24),
+                )
                 
                 if recent_24h:
                     failed_count = sum(1 for m in recent_24h if m.get("state") in ("failed", "crashed"))
@@ -103,33 +93,30 @@ def preflight(
                     else:
                         all_checks.append({"passed": False, "message": msg, "severity": "warning"})
                         print_warning(msg)
-                else:
+                elif cache.get_config_hash_matches(
+                    config_hash=config_hash,
+                    entity=entity,
+                    project=project,
+                    limit=1,
+                ):
                     all_checks.append({"passed": True, "message": "No recent duplicate configs found"})
                     print_success("No recent duplicate configs found")
-            else:
-                all_checks.append({"passed": True, "message": "No matching configs in history"})
-                print_success("No matching configs in history")
-            
-            console.print()
-            print_info("Checking for failure patterns...")
-            
-            runs = cache.query_runs(entity=entity, project=project)
-            recent_failures = [
-                r for r in runs
-                if r.get("state") in ("failed", "crashed")
-                and r.get("runtime_seconds") is not None
-                and r.get("runtime_seconds") < 300
-            ]
-            
-            if len(recent_failures) > 5:
-                msg = f"{len(recent_failures)} runs failed within 5 minutes (early crash pattern)"
-                all_checks.append({"passed": False, "message": msg, "severity": "warning"})
-                print_warning(msg)
-            else:
-                all_checks.append({"passed": True, "message": "No concerning failure patterns"})
-                print_success("No concerning failure patterns")
-        
-        cache.close()
+                else:
+                    all_checks.append({"passed": True, "message": "No matching configs in history"})
+                    print_success("No matching configs in history")
+                
+                console.print()
+                print_info("Checking for failure patterns...")
+                
+                early_failures = cache.count_early_failures(entity=entity, project=project)
+                
+                if early_failures > 5:
+                    msg = f"{early_failures} runs failed within 5 minutes (early crash pattern)"
+                    all_checks.append({"passed": False, "message": msg, "severity": "warning"})
+                    print_warning(msg)
+                else:
+                    all_checks.append({"passed": True, "message": "No concerning failure patterns"})
+                    print_success("No concerning failure patterns")
         
     except Exception as e:
         print_warning(f"Could not check cache: {e}")
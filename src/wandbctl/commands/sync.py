@@ -1,9 +1,11 @@
+import time
 from datetime import datetime, timezone
+from typing import Iterable, Iterator
 
 import click
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TaskID, TextColumn
 
-from wandbctl.api import WandbClient
+from wandbctl.api import RunMetadata, WandbClient
 from wandbctl.cache import Cache
 from wandbctl.utils.display import (
     console,
@@ -14,6 +16,60 @@ from wandbctl.utils.display import (
 )
 
 
+PROGRESS_INTERVAL_SECONDS = 0.05
+
+
+def track_fetched(
+    runs: Iterable[RunMetadata],
+    progress: Progress,
+    task: TaskID,
+) -> Iterator[RunMetadata]:
+    # Rendering on every run dominates large syncs; refresh at most ~20x/s.
+    fetched = 0
+    last_update = time.monotonic()
+    for run in runs:
+        fetched += 1
+        now = time.monotonic()
+        if now - last_update >= PROGRESS_INTERVAL_SECONDS:
+            progress.update(task, description=f"Fetched {fetched} runs...")
+            last_update = now
+        yield run
+    progress.update(task, description=f"Fetched {fetched} runs...")
+
+
+def sync_runs(
+    cache: Cache,
+    entity: str | None,
+    project: str | None,
+    since: datetime | None,
+) -> int:
+    client = WandbClient()
+    entity = entity or client.default_entity
+    if not entity:
+        print_error("No entity specified and no default entity found. Set WANDB_API_KEY or use --entity.")
+        raise SystemExit(1)
+    
+    print_info(f"Syncing runs from {entity}" + (f"/{project}" if project else ""))
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Fetching runs...", total=None)
+        
+        filters = {}
+        if since:
+            filters["created_at"] = {"$gte": since.isoformat()}
+        
+        runs = client.list_runs(entity=entity, project=project, filters=filters if filters else None)
+        count = cache.load_runs(track_fetched(runs, progress, task))
+        cache.log_sync(entity, project, count)
+    
+    print_success(f"Synced {count} runs to cache")
+    return count
+
+
 @click.command()
 @click.option("--entity", "-e", help="W&B entity (username or team)")
 @click.option("--project", "-p", help="W&B project name")
@@ -24,38 +80,8 @@ from wandbctl.utils.display import (
 )
 def sync(entity: str | None, project: str | None, since: datetime | None):
     try:
-        client = WandbClient()
-        cache = Cache()
-        
-        entity = entity or client.default_entity
-        if not entity:
-            print_error("No entity specified and no default entity found. Set WANDB_API_KEY or use --entity.")
-            raise SystemExit(1)
-        
-        print_info(f"Syncing runs from {entity}" + (f"/{project}" if project else ""))
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Fetching runs...", total=None)
-            
-            runs = []
-            filters = {}
-            if since:
-                filters["created_at"] = {"$gte": since.isoformat()}
-            
-            for run_meta in client.list_runs(entity=entity, project=project, filters=filters if filters else None):
-                runs.append(run_meta)
-                progress.update(task, description=f"Fetched {len(runs)} runs...")
-            
-            progress.update(task, description="Saving to cache...")
-            count = cache.upsert_runs(runs)
-            cache.log_sync(entity, project, count)
-        
-        print_success(f"Synced {count} runs to cache")
-        cache.close()
+        with Cache() as cache:
+            sync_runs(cache, entity, project, since)
         
     except ConnectionError as e:
         print_error(str(e))
@@ -70,25 +96,22 @@ def sync(entity: str | None, project: str | None, since: datetime | None):
 @click.option("--project", "-p", help="Filter by project")
 def status(entity: str | None, project: str | None):
     try:
-        cache = Cache()
-        
-        run_count = cache.get_run_count(entity=entity, project=project)
-        cache_size = cache.get_cache_size_bytes()
-        last_sync = cache.get_last_sync(entity=entity, project=project)
-        
-        table = create_status_table(
-            run_count=run_count,
-            cache_size=cache_size,
-            last_sync=last_sync,
-            cache_path=str(cache.path),
-        )
-        
-        console.print(table)
-        
-        if run_count == 0:
-            print_info("No cached runs. Run 'wandbctl sync' to populate cache.")
-        
-        cache.close()
+        with Cache(read_only=True) as cache:
+            run_count = cache.get_run_count(entity=entity, project=project)
+            cache_size = cache.get_cache_size_bytes()
+            last_sync = cache.get_last_sync(entity=entity, project=project)
+            
+            table = create_status_table(
+                run_count=run_count,
+                cache_size=cache_size,
+                last_sync=last_sync,
+                cache_path=str(cache.path),
+            )
+            
+            console.print(table)
+            
+            if run_count == 0:
+                print_info("No cached runs. Run 'wandbctl sync' to populate cache.")
         
     except Exception as e:
         print_error(f"Failed to get status: {e}")
@@ -16,26 +16,33 @@ from wandbctl.utils.display import (
 )
 
 
+def _minutes_since_update(updated_at: datetime | None, now: datetime) -> float | None:
+    if not updated_at:
+        return None
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return (now - updated_at).total_seconds() / 60
+
+
 def classify_zombie(
     run: dict,
     threshold_minutes: int,
     avg_runtime: float | None,
+    now: datetime | None = None,
 ) -> dict | None:
     updated_at = run.get("updated_at")
     runtime = run.get("runtime_seconds")
     
-    if not updated_at:
+    if now is None:
+        now = datetime.now(timezone.utc)
+    minutes_since_update = _minutes_since_update(updated_at, now)
+    
+    if minutes_since_update is None or minutes_since_update < threshold_minutes:
         return None
     
-    now = datetime.now(timezone.utc)
     if updated_at.tzinfo is None:
         updated_at = updated_at.replace(tzinfo=timezone.utc)
     
-    minutes_since_update = (now - updated_at).total_seconds() / 60
-    
-    if minutes_since_update < threshold_minutes:
-        return None
-    
     confidence = "medium"
     reasons = []
     
@@ -78,26 +85,33 @@ def classify_zombie(
 def zombies(entity: str | None, project: str | None, threshold: int):
     try:
         client = WandbClient()
-        cache = Cache()
-        
-        entity = entity or client.default_entity
-        if not entity:
-            print_error("No entity specified and no default entity found.")
-            raise SystemExit(1)
-        
-        print_data_source("live", None)
-        print_info(f"Checking running runs (threshold: {threshold}m)...")
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Fetching running runs...", total=None)
+        with Cache(read_only=True) as cache:
+            entity = entity or client.default_entity
+            if not entity:
+                print_error("No entity specified and no default entity found.")
+                raise SystemExit(1)
             
-            running_runs = []
-            for run_meta in client.list_running_runs(entity=entity, project=project):
-                running_runs.append({
+            print_data_source("live", None)
+            print_info(f"Checking running runs (threshold: {threshold}m)...")
+            
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+            ) as progress:
+                task = progress.add_task("Fetching running runs...", total=None)
+                
+                running_runs = list(client.list_running_runs(entity=entity, project=project))
+                
+                progress.update(task, description=f"Found {len(running_runs)} running runs")
+            
+            if not running_runs:
+                print_success("No running runs found.")
+                return
+            
+            now = datetime.now(timezone.utc)
+            stale_runs = [
+                {
                     "id": run_meta.id,
                     "entity": run_meta.entity,
                     "project": run_meta.project,
@@ -105,39 +119,32 @@ def zombies(entity: str | None, project: str | None, threshold: int):
                     "state": run_meta.state,
                     "runtime_seconds": run_meta.runtime_seconds,
                     "updated_at": run_meta.updated_at,
-                })
+                }
+                for run_meta in running_runs
+                if (_minutes_since_update(run_meta.updated_at, now) or 0) >= threshold
+            ]
+            
+            avg_runtime = None
+            if any(run.get("runtime_seconds") for run in stale_runs):
+                avg_runtime = cache.get_avg_finished_runtime(entity=entity, project=project)
+            
+            zombie_runs = []
+            for run in stale_runs:
+                zombie = classify_zombie(run, threshold, avg_runtime, now=now)
+                if zombie:
+                    zombie_runs.append(zombie)
             
-            progress.update(task, description=f"Found {len(running_runs)} running runs")
-        
-        if not running_runs:
-            print_success("No running runs found.")
-            cache.close()
-            return
-        
-        stats = cache.get_usage_stats(entity=entity, project=project)
-        total_runs = stats.get("finished_runs", 0)
-        total_runtime = stats.get("total_runtime_seconds", 0)
-        avg_runtime = total_runtime / total_runs if total_runs > 0 else None
-        
-        zombie_runs = []
-        for run in running_runs:
-            zombie = classify_zombie(run, threshold, avg_runtime)
-            if zombie:
-                zombie_runs.append(zombie)
-        
-        console.print()
-        
-        if not zombie_runs:
-            print_success(f"No zombies detected among {len(running_runs)} running runs.")
-        else:
-            print_warning(f"Found {len(zombie_runs)} potential zombie run(s)")
-            console.print()
-            table = create_zombies_table(zombie_runs)
-            console.print(table)
             console.print()
-            console.print("[dim]Verify these runs manually before terminating.[/dim]")
-        
-        cache.close()
+            
+            if not zombie_runs:
+                print_success(f"No zombies detected among {len(running_runs)} running runs.")
+            else:
+                print_warning(f"Found {len(zombie_runs)} potential zombie run(s)")
+                console.print()
+                table = create_zombies_table(zombie_runs)
+                console.print(table)
+                console.print()
+                console.print("[dim]Verify these runs manually before terminating.[/dim]")
         
     except SystemExit:
         raise
@@ -5,6 +5,17 @@ from typing import Any
 
 import yaml
 
+from wandbctl.utils.serialization import loads
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+# Hashes are persisted in the cache; keep the canonical form stable.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
 
 def load_config(path: str | Path) -> dict[str, Any]:
     path = Path(path)
@@ -15,18 +26,18 @@ def load_config(path: str | Path) -> dict[str, Any]:
     content = path.read_text()
     
     if path.suffix in (".yaml", ".yml"):
-        return yaml.safe_load(content) or {}
+        return yaml.load(content, Loader=SafeLoader) or {}
     elif path.suffix == ".json":
-        return json.loads(content)
+        return loads(content)
     else:
         try:
-            return yaml.safe_load(content) or {}
+            return yaml.load(content, Loader=SafeLoader) or {}
         except yaml.YAMLError:
-            return json.loads(content)
+            return loads(content)
 
 
 def hash_config(config: dict) -> str:
-    normalized = json.dumps(config, sort_keys=True, default=str)
+    normalized = _CANONICAL_ENCODER.encode(config)
     return hashlib.sha256(normalized.encode()).hexdigest()[:16]
 
 
@@ -9,6 +9,11 @@ from rich.text import Text
 
 console = Console()
 
+CONFIDENCE_LABELS = {
+    "high": Text("HIGH", style="red bold"),
+    "medium": Text("MEDIUM", style="yellow"),
+}
+
 
 def format_duration(seconds: Optional[int]) -> str:
     if seconds is None:
@@ -25,11 +30,12 @@ def format_duration(seconds: Optional[int]) -> str:
         return f"{seconds}s"
 
 
-def format_time_ago(dt: Optional[datetime]) -> str:
+def format_time_ago(dt: Optional[datetime], now: Optional[datetime] = None) -> str:
     if dt is None:
         return "—"
     
-    now = datetime.now(timezone.utc)
+    if now is None:
+        now = datetime.now(timezone.utc)
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
     
@@ -120,14 +126,14 @@ def create_zombies_table(zombies: list[dict]) -> Table:
     table.add_column("Last Update", justify="right")
     table.add_column("Confidence", justify="center")
     
+    now = datetime.now(timezone.utc)
     for z in zombies:
-        confidence_style = "red bold" if z["confidence"] == "high" else "yellow"
         table.add_row(
             z["id"][:8],
             z["project"],
             format_duration(z["runtime_seconds"]),
-            format_time_ago(z["updated_at"]),
-            f"[{confidence_style}]{z['confidence'].upper()}[/{confidence_style}]"
+            format_time_ago(z["updated_at"], now),
+            CONFIDENCE_LABELS[z["confidence"]],
         )
     
     return table
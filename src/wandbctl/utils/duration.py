@@ -0,0 +1,30 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+
+_DURATION_RE = re.compile(r"^(\d+)([hdwm])$")
+
+_UNIT_DELTAS = {
+    "h": timedelta(hours=1),
+    "d": timedelta(days=1),
+    "w": timedelta(weeks=1),
+    "m": timedelta(days=30),
+}
+
+_UNIT_EXAMPLES = {"h": "'24h'", "d": "'7d'", "w": "'1w'", "m": "'3m'"}
+
+
+def parse_duration(duration_str: str, units: str = "hdwm") -> timedelta:
+    match = _DURATION_RE.match(duration_str.lower())
+    if not match or match.group(2) not in units:
+        examples = ", ".join(_UNIT_EXAMPLES[u] for u in units)
+        raise ValueError(f"Invalid duration format: {duration_str}. Use format like {examples}")
+    
+    return int(match.group(1)) * _UNIT_DELTAS[match.group(2)]
+
+
+def parse_since(duration: Optional[str], units: str = "hdwm") -> Optional[datetime]:
+    if not duration:
+        return None
+    return datetime.now(timezone.utc) - parse_duration(duration, units)
@@ -0,0 +1,67 @@
+import json
+import math
+from datetime import date
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> str:
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+def dumps(obj: Any) -> str:
+    # orjson writes NaN/Infinity as null and rejects non-str keys; fall back
+    # to the stdlib so stored JSON is the same with or without orjson.
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(obj)
+        except TypeError:
+            pass
+        else:
+            if b"null" not in encoded or not _has_non_finite(obj):
+                return encoded.decode()
+    return json.dumps(obj)
+
+
+def dumps_bytes(obj: Any, *, indent: bool = False) -> bytes:
+    # Datetimes are written as ISO 8601 and anything else unknown as str(),
+    # matching orjson's native datetime output in the stdlib fallback.
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=_default).encode()
+
+
+def raw_json(data: str) -> Any:
+    # orjson writes a Fragment's text verbatim, so already-serialized JSON
+    # can be embedded without a parse/serialize round trip.
+    if orjson is not None and hasattr(orjson, "Fragment"):
+        return orjson.Fragment(data)
+    return loads(data)
+
+
+def loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Rows written by the stdlib encoder may contain NaN/Infinity,
+            # which orjson rejects.
+            pass
+    return json.loads(data)
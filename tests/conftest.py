@@ -0,0 +1,32 @@
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+
+RUNNING_RUN_TEMPLATE = {
+    "entity": "test-entity",
+    "project": "test-project",
+    "state": "running",
+}
+
+
+@pytest.fixture(scope="session")
+def now_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@pytest.fixture(scope="session")
+def make_running_run(now_utc):
+    def _make_running_run(
+        id: str = "test-run",
+        runtime: int = 3600,
+        minutes_since_update: int = 5,
+    ) -> dict:
+        run = RUNNING_RUN_TEMPLATE.copy()
+        run["id"] = id
+        run["name"] = f"Run {id}"
+        run["runtime_seconds"] = runtime
+        run["updated_at"] = now_utc - timedelta(minutes=minutes_since_update)
+        return run
+    
+    return _make_running_run
@@ -0,0 +1,64 @@
+import dataclasses
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from wandbctl.api import RunMetadata, _coerce_dt
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def test_coerce_dt_parses_utc_suffix():
+    assert _coerce_dt("2024-01-01T12:00:00Z") == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    assert _coerce_dt("2024-01-01T12:00:00") == datetime(2024, 1, 1, 12)
+
+
+def test_coerce_dt_passes_through_datetimes():
+    dt = datetime(2024, 1, 1, 12)
+    
+    assert _coerce_dt(dt) is dt
+
+
+def test_coerce_dt_rejects_invalid():
+    assert _coerce_dt(None) is None
+    assert _coerce_dt("") is None
+    assert _coerce_dt("not a date") is None
+    assert _coerce_dt(1704110400) is None
+
+
+def test_cli_import_does_not_load_wandb():
+    code = "import sys, wandbctl.cli; sys.exit('wandb' in sys.modules)"
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    
+    assert subprocess.run([sys.executable, "-c", code], env=env).returncode == 0
+
+
+def test_run_metadata_is_frozen():
+    run = RunMetadata(
+        id="r1",
+        entity="e",
+        project="p",
+        name="r1",
+        state="finished",
+        created_at=None,
+        updated_at=None,
+        runtime_seconds=60,
+        config={"seed": 1},
+        summary={},
+        gpu_count=None,
+    )
+    original_hash = run.config_hash
+    
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        run.config = {"seed": 2}
+    
+    changed = dataclasses.replace(run, config={"seed": 2})
+    assert run.config_hash == original_hash
+    assert changed.config_hash != original_hash
+    assert json.loads(changed.config_json) == {"seed": 2}
@@ -1,12 +1,17 @@
 import json
+import math
+from dataclasses import replace
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import tempfile
 
+import duckdb
 import pytest
 
-from wandbctl.cache import Cache
+from wandbctl.cache import Cache, RUN_COLUMNS, UPSERT_CHUNK_SIZE
 from wandbctl.api import RunMetadata
+from wandbctl.utils.config import hash_config
+from wandbctl.utils.serialization import loads
 
 
 @pytest.fixture
@@ -122,3 +127,476 @@ def test_get_running_runs(temp_cache):
     
     running = temp_cache.get_running_runs()
     assert len(running) == 2
+
+
+def test_upsert_runs_batch_replaces_existing(temp_cache):
+    temp_cache.upsert_runs([make_run(id="r1", state="running", runtime=60)])
+    temp_cache.upsert_runs([
+        make_run(id="r1", state="finished", runtime=120),
+        make_run(id="r2"),
+    ])
+    
+    assert temp_cache.get_run_count() == 2
+    
+    results = {r["id"]: r for r in temp_cache.query_runs(columns=RUN_COLUMNS)}
+    assert results["r1"]["state"] == "finished"
+    assert results["r1"]["runtime_seconds"] == 120
+    assert json.loads(results["r1"]["config"]) == {"seed": 42, "lr": 0.001}
+    assert json.loads(results["r1"]["summary"]) == {"loss": 0.1}
+
+
+def test_upsert_runs_non_ascii(temp_cache):
+    run = replace(make_run(id="r1"), name="résumé 実験", config={"model": "naïve-bayes"})
+    
+    temp_cache.upsert_runs([run])
+    
+    result = temp_cache.query_runs(columns=("id", "name", "config"))[0]
+    assert result["name"] == "résumé 実験"
+    assert loads(result["config"]) == {"model": "naïve-bayes"}
+
+
+def test_upsert_preserves_nan_summary(temp_cache):
+    batched = make_run(id="r1")
+    batched = replace(batched, summary={"loss": float("nan"), "best": float("inf")})
+    single = make_run(id="r2")
+    single = replace(single, summary={"loss": float("nan")})
+    
+    temp_cache.upsert_runs([batched])
+    temp_cache.upsert_run(single)
+    
+    results = {r["id"]: r for r in temp_cache.query_runs(columns=("id", "summary"))}
+    assert math.isnan(loads(results["r1"]["summary"])["loss"])
+    assert loads(results["r1"]["summary"])["best"] == float("inf")
+    assert math.isnan(loads(results["r2"]["summary"])["loss"])
+
+
+def test_upsert_runs_batch_duplicate_ids(temp_cache):
+    count = temp_cache.upsert_runs([
+        make_run(id="r1", runtime=60),
+        make_run(id="r1", runtime=120),
+    ])
+    
+    assert count == 1
+    assert temp_cache.query_runs()[0]["runtime_seconds"] == 120
+
+
+def test_upsert_runs_batch_stores_utc(temp_cache):
+    run = make_run(id="r1")
+    run = replace(
+        run,
+        created_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=2))),
+        updated_at=None,
+    )
+    temp_cache.upsert_runs([run])
+    
+    result = temp_cache.query_runs()[0]
+    assert result["created_at"] == datetime(2024, 1, 1, 10, 0)
+    assert result["updated_at"] is None
+
+
+def test_get_config_hash_matches(temp_cache):
+    run = make_run(id="r1")
+    other = make_run(id="r2")
+    other = replace(other, config={"seed": 7})
+    temp_cache.upsert_runs([run, other])
+    temp_cache.upsert_run(make_run(id="r3"))
+    
+    matches = temp_cache.get_config_hash_matches(hash_config({"lr": 0.001, "seed": 42}))
+    assert sorted(m["id"] for m in matches) == ["r1", "r3"]
+    
+    matches = temp_cache.get_config_hash_matches(hash_config({"seed": 42}))
+    assert matches == []
+
+
+def test_get_config_hash_matches_within(temp_cache):
+    old = make_run(id="old")
+    old = replace(old, created_at=datetime.now(timezone.utc) - timedelta(days=3))
+    temp_cache.upsert_runs([old, make_run(id="new")])
+    config_hash = hash_config({"lr": 0.001, "seed": 42})
+    
+    recent = temp_cache.get_config_hash_matches(config_hash, within=timedelta(hours=24))
+    assert [m["id"] for m in recent] == ["new"]
+    
+    everything = temp_cache.get_config_hash_matches(config_hash)
+    assert [m["id"] for m in everything] == ["new", "old"]
+
+
+def test_migrate_adds_config_hash():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = Path(tmpdir) / "old_cache.duckdb"
+        conn = duckdb.connect(str(cache_path))
+        conn.execute(
+            """
+            CREATE TABLE runs (
+                id VARCHAR PRIMARY KEY, entity VARCHAR NOT NULL, project VARCHAR NOT NULL,
+                name VARCHAR, state VARCHAR, created_at TIMESTAMP, updated_at TIMESTAMP,
+                runtime_seconds INTEGER, config JSON, summary JSON, gpu_count INTEGER,
+                synced_at TIMESTAMP NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO runs (id, entity, project, config, synced_at) VALUES (?, ?, ?, ?, now())",
+            ["old-run", "e", "p", json.dumps({"seed": 42, "lr": 0.001})]
+        )
+        conn.close()
+        
+        cache = Cache(path=cache_path)
+        matches = cache.get_config_hash_matches(hash_config({"lr": 0.001, "seed": 42}))
+        cache.close()
+        
+        assert [m["id"] for m in matches] == ["old-run"]
+
+
+def test_runs_before_cutoff(temp_cache):
+    old = make_run(id="old", project="archive")
+    old = replace(old, created_at=datetime.now(timezone.utc) - timedelta(days=120))
+    older = make_run(id="older", project="archive")
+    older = replace(older, created_at=datetime.now(timezone.utc) - timedelta(days=200))
+    temp_cache.upsert_runs([older, old, make_run(id="new")])
+    
+    cutoff = datetime.now(timezone.utc) - timedelta(days=90)
+    assert temp_cache.count_runs_before(cutoff) == 2
+    assert temp_cache.sample_runs_before(cutoff) == [("old", "archive"), ("older", "archive")]
+    assert temp_cache.sample_runs_before(cutoff, limit=1) == [("old", "archive")]
+    
+    assert temp_cache.delete_runs_before(cutoff) == 2
+    assert temp_cache.get_run_count() == 1
+
+
+def test_get_cost_breakdown(temp_cache):
+    temp_cache.upsert_runs([
+        make_run(id="r1", project="small", runtime=3600, gpu_count=1),
+        make_run(id="r2", project="big", runtime=3600, gpu_count=8),
+        make_run(id="r3", project="big", runtime=1800, gpu_count=2),
+        make_run(id="r4", project="cpu", runtime=3600, gpu_count=0),
+    ])
+    
+    breakdown = temp_cache.get_cost_breakdown()
+    
+    assert [row["project"] for row in breakdown] == ["big", "cpu", "small"]
+    assert breakdown[0]["runs"] == 2
+    assert breakdown[0]["runtime_seconds"] == 5400
+    assert breakdown[0]["gpu_seconds"] == 3600 * 8 + 1800 * 2
+    assert breakdown[1]["gpu_seconds"] == 3600
+
+
+def test_query_runs_columns(temp_cache):
+    temp_cache.upsert_run(make_run(id="r1"))
+    
+    lite = temp_cache.query_runs()[0]
+    assert "config" not in lite and "summary" not in lite
+    
+    selected = temp_cache.query_runs(columns=("id", "state"))
+    assert selected == [{"id": "r1", "state": "finished"}]
+    
+    with pytest.raises(ValueError):
+        temp_cache.query_runs(columns=("id", "1; DROP TABLE runs"))
+
+
+def test_get_runs_by_ids(temp_cache):
+    temp_cache.upsert_runs([
+        make_run(id="abc12345"),
+        make_run(id="abd99999"),
+        make_run(id="xyz00000", project="other"),
+    ])
+    
+    found = temp_cache.get_runs_by_ids(["abc12345", "abd", "xyz", "missing"])
+    
+    assert found["abc12345"]["id"] == "abc12345"
+    assert found["abd"]["id"] == "abd99999"
+    assert found["xyz"]["config"] is not None
+    assert "missing" not in found
+    
+    scoped = temp_cache.get_runs_by_ids(["xyz"], project="test-project")
+    assert scoped == {}
+
+
+def test_upsert_run_stores_utc(temp_cache):
+    run = make_run(id="r1")
+    run = replace(run, created_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=-5))))
+    temp_cache.upsert_run(run)
+    
+    assert temp_cache.query_runs()[0]["created_at"] == datetime(2024, 1, 1, 17, 0)
+
+
+def test_upsert_runs_chunked(temp_cache):
+    runs = (make_run(id=f"run-{i}") for i in range(25))
+    
+    count = temp_cache.upsert_runs_chunked(runs, chunk_size=10)
+    
+    assert count == 25
+    assert temp_cache.get_run_count() == 25
+
+
+def test_upsert_runs_chunked_rolls_back_on_error(temp_cache):
+    def failing_runs():
+        for i in range(15):
+            yield make_run(id=f"run-{i}")
+        raise ConnectionError("lost connection")
+    
+    with pytest.raises(ConnectionError):
+        temp_cache.upsert_runs_chunked(failing_runs(), chunk_size=10)
+    
+    assert temp_cache.get_run_count() == 0
+    
+    temp_cache.upsert_runs([make_run(id="after")])
+    assert temp_cache.get_run_count() == 1
+
+
+def test_bulk_load_restores_indexes(temp_cache):
+    with temp_cache.bulk_load():
+        temp_cache.upsert_runs_chunked(make_run(id=f"run-{i}") for i in range(5))
+    
+    matches = temp_cache.get_config_hash_matches(hash_config({"lr": 0.001, "seed": 42}))
+    assert len(matches) == 5
+    
+    indexes = temp_cache._conn.execute(
+        "SELECT index_name FROM duckdb_indexes() WHERE table_name = 'runs'"
+    ).fetchall()
+    assert {name for (name,) in indexes} >= {
+        "idx_runs_entity_project",
+        "idx_runs_state",
+        "idx_runs_created",
+        "idx_runs_config_hash",
+    }
+
+
+def test_get_run_count_filters(temp_cache):
+    temp_cache.upsert_runs([
+        make_run(id="r1", entity="team-a", project="p1"),
+        make_run(id="r2", entity="team-a", project="p2"),
+        make_run(id="r3", entity="team-b", project="p1"),
+    ])
+    
+    assert temp_cache.get_run_count() == 3
+    assert temp_cache.get_run_count(entity="team-a") == 2
+    assert temp_cache.get_run_count(entity="team-a", project="p1") == 1
+    assert temp_cache.get_run_count(project="p1") == 2
+
+
+def test_read_only_cache():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = Path(tmpdir) / "test_cache.duckdb"
+        
+        cache = Cache(path=cache_path, read_only=True)
+        assert not cache.read_only
+        cache.upsert_run(make_run(id="r1"))
+        cache.close()
+        
+        reader = Cache(path=cache_path, read_only=True)
+        other_reader = Cache(path=cache_path, read_only=True)
+        assert reader.read_only
+        assert reader.get_run_count() == 1
+        assert other_reader.get_run_count() == 1
+        with pytest.raises(duckdb.Error):
+            reader.upsert_run(make_run(id="r2"))
+        reader.close()
+        other_reader.close()
+
+
+@pytest.mark.parametrize("run_count,expect_bulk", [(3, False), (UPSERT_CHUNK_SIZE + 1, True)])
+def test_load_runs_rebuilds_indexes_only_for_large_loads(temp_cache, run_count, expect_bulk):
+    bulk_loads = []
+    bulk_load = temp_cache.bulk_load
+    
+    def recording_bulk_load():
+        bulk_loads.append(True)
+        return bulk_load()
+    
+    temp_cache.bulk_load = recording_bulk_load
+    
+    count = temp_cache.load_runs(make_run(id=f"run-{i}") for i in range(run_count))
+    
+    assert count == run_count
+    assert temp_cache.get_run_count() == run_count
+    assert bool(bulk_loads) == expect_bulk
+
+
+def test_pragmas():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = Path(tmpdir) / "test_cache.duckdb"
+        cache = Cache(path=cache_path, pragmas={"threads": "2"})
+        
+        threads = cache._conn.execute("SELECT current_setting('threads')").fetchone()[0]
+        assert threads == 2
+        
+        before = cache._conn.execute("SELECT current_setting('checkpoint_threshold')").fetchone()[0]
+        with cache.bulk_load():
+            cache.upsert_runs([make_run(id="r1")])
+        after = cache._conn.execute("SELECT current_setting('checkpoint_threshold')").fetchone()[0]
+        assert after == before
+        assert cache.get_run_count() == 1
+        cache.close()
+
+
+def test_cache_size_bytes(temp_cache):
+    size = temp_cache.get_cache_size_bytes()
+    
+    assert size == temp_cache.path.stat().st_size
+    assert temp_cache.get_cache_size_bytes() == size
+    
+    temp_cache._size_cache = None
+    assert temp_cache.get_cache_size_bytes() == size
+
+
+def test_get_project_stats(temp_cache):
+    temp_cache.upsert_runs([
+        make_run(id="r1", project="p1", state="finished", runtime=3600, gpu_count=2),
+        make_run(id="r2", project="p1", state="crashed", runtime=1800, gpu_count=None),
+        make_run(id="r3", project="p1", state="running", runtime=0),
+        make_run(id="r4", project="p2", state="failed", runtime=None),
+        make_run(id="r5", entity="other", project="p3"),
+    ])
+    
+    stats = temp_cache.get_project_stats(entity="test-entity")
+    
+    assert [s["project"] for s in stats] == ["p1", "p2"]
+    assert stats[0]["runs"] == 3
+    assert (stats[0]["finished"], stats[0]["failed"], stats[0]["running"]) == (1, 1, 1)
+    assert stats[0]["runtime_seconds"] == 5400
+    assert stats[0]["gpu_hours"] == 2.5
+    assert stats[1]["failed"] == 1
+    assert stats[1]["runtime_seconds"] == 0
+
+
+def test_query_top_runs(temp_cache):
+    temp_cache.upsert_runs([
+        make_run(id="r1", runtime=3600, gpu_count=1),
+        make_run(id="r2", runtime=1800, gpu_count=4),
+        make_run(id="r3", runtime=600, gpu_count=None, state="failed"),
+    ])
+    
+    by_runtime = temp_cache.query_top_runs(by="runtime", limit=2)
+    assert [r["id"] for r in by_runtime] == ["r1", "r2"]
+    
+    by_gpu = temp_cache.query_top_runs(by="gpu-hours", limit=2)
+    assert [r["id"] for r in by_gpu] == ["r2", "r1"]
+    
+    failed = temp_cache.query_top_runs(state="failed")
+    assert [r["id"] for r in failed] == ["r3"]
+    assert temp_cache.get_run_count(state="failed") == 1
+    
+    with pytest.raises(ValueError):
+        temp_cache.query_top_runs(by="name")
+
+
+def test_iter_runs(temp_cache):
+    temp_cache.upsert_runs([make_run(id=f"r{i}") for i in range(5)])
+    
+    runs = temp_cache.iter_runs(columns=("id", "state"), batch_size=2)
+    first = next(runs)
+    assert temp_cache.get_run_count() == 5
+    rest = list(runs)
+    
+    assert {r["id"] for r in [first] + rest} == {f"r{i}" for i in range(5)}
+    assert all(set(r) == {"id", "state"} for r in rest)
+
+
+def test_get_failure_breakdown(temp_cache):
+    temp_cache.upsert_runs([
+        make_run(id="r1", project="p1", state="failed", runtime=60),
+        make_run(id="r2", project="p1", state="crashed", runtime=None),
+        make_run(id="r3", project="p2", state="failed", runtime=300),
+        make_run(id="r4", project="p2", state="failed", runtime=3600),
+        make_run(id="r5", project="p2", state="finished", runtime=60),
+    ])
+    
+    breakdown = temp_cache.get_failure_breakdown()
+    
+    assert breakdown["total_runs"] == 5
+    assert breakdown["failed_runs"] == 4
+    assert breakdown["early_failures"] == 2
+    assert breakdown["medium_failures"] == 1
+    assert breakdown["late_failures"] == 1
+    assert breakdown["by_project"] == [("p1", 2), ("p2", 2)]
+    
+    assert temp_cache.get_failure_breakdown(top_projects=1)["by_project"] == [("p1", 2)]
+
+
+def test_upsert_runs_accepts_iterator(temp_cache):
+    count = temp_cache.upsert_runs(make_run(id=f"r{i}") for i in range(3))
+    
+    assert count == 3
+    assert temp_cache.get_run_count() == 3
+
+
+def test_cache_context_manager():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = Path(tmpdir) / "test_cache.duckdb"
+        
+        with Cache(path=cache_path) as cache:
+            cache.upsert_run(make_run(id="r1"))
+        
+        with pytest.raises(duckdb.Error):
+            cache.get_run_count()
+        
+        with Cache(path=cache_path, read_only=True) as reader:
+            assert reader.get_run_count() == 1
+
+
+def test_get_avg_finished_runtime(temp_cache):
+    assert temp_cache.get_avg_finished_runtime() is None
+    
+    temp_cache.upsert_runs([
+        make_run(id="r1", runtime=100),
+        make_run(id="r2", runtime=300),
+        make_run(id="r3", runtime=None),
+        make_run(id="r4", state="failed", runtime=5000),
+        make_run(id="r5", project="other", runtime=1000),
+    ])
+    
+    assert temp_cache.get_avg_finished_runtime(project="test-project") == 200
+    assert temp_cache.get_avg_finished_runtime(entity="test-entity") == pytest.approx(1400 / 3)
+
+
+def test_count_early_failures(temp_cache):
+    temp_cache.upsert_runs([
+        make_run(id="r1", state="failed", runtime=60),
+        make_run(id="r2", state="crashed", runtime=299),
+        make_run(id="r3", state="failed", runtime=300),
+        make_run(id="r4", state="failed", runtime=None),
+        make_run(id="r5", state="finished", runtime=60),
+        make_run(id="r6", project="other", state="failed", runtime=60),
+    ])
+    
+    assert temp_cache.count_early_failures() == 3
+    assert temp_cache.count_early_failures(project="test-project") == 2
+
+
+def test_get_run_trends(temp_cache):
+    runs = []
+    for i, (day, runtime) in enumerate([(1, 100), (1, 50), (3, None), (9, 10)]):
+        run = make_run(id=f"r{i}", runtime=runtime)
+        run = replace(run, created_at=datetime(2024, 1, day, 12, tzinfo=timezone.utc))
+        runs.append(run)
+    temp_cache.upsert_runs(runs)
+    
+    daily = temp_cache.get_run_trends(since=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    assert [(b["bucket"], b["runs"], b["runtime_seconds"]) for b in daily] == [
+        ("2024-01-01", 2, 150),
+        ("2024-01-03", 1, 0),
+        ("2024-01-09", 1, 10),
+    ]
+    
+    weekly = temp_cache.get_run_trends(group="week")
+    assert [(b["bucket"], b["runs"]) for b in weekly] == [("2024-W01", 3), ("2024-W02", 1)]
+    
+    with pytest.raises(ValueError):
+        temp_cache.get_run_trends(group="month")
+
+
+def test_get_run_trends_dense(temp_cache):
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    run = make_run(id="r1", runtime=60)
+    run = replace(run, created_at=today - timedelta(days=2) + timedelta(hours=1))
+    temp_cache.upsert_runs([run])
+    
+    buckets = temp_cache.get_run_trends(since=today - timedelta(days=3), dense=True)
+    
+    assert [b["runs"] for b in buckets] == [0, 1, 0, 0]
+    assert buckets[-1]["bucket"] == today.strftime("%Y-%m-%d")
+    assert buckets[1]["runtime_seconds"] == 60
+    
+    with pytest.raises(ValueError):
+        temp_cache.get_run_trends(dense=True)
@@ -3,6 +3,7 @@ import tempfile
 from pathlib import Path
 
 import pytest
+import yaml
 
 from wandbctl.utils.config import load_config, hash_config, validate_config
 
@@ -30,6 +31,15 @@ def test_load_json_config():
         assert config["epochs"] == 10
 
 
+def test_load_yaml_config_rejects_python_tags():
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        f.write("seed: !!python/object/apply:os.getcwd []\n")
+        f.flush()
+        
+        with pytest.raises(yaml.YAMLError):
+            load_config(f.name)
+
+
 def test_load_missing_config():
     with pytest.raises(FileNotFoundError):
         load_config("/nonexistent/path/config.yaml")
@@ -101,3 +111,9 @@ def test_validate_config_invalid_lr():
     
     failed = [r for r in results if not r["passed"]]
     assert any("learning_rate" in r["message"] for r in failed)
+
+
+def test_hash_config_is_stable():
+    config = {"seed": 42, "lr": 0.001, "model": {"layers": [64, 128]}, "name": "résnet"}
+    
+    assert hash_config(config) == "240049b3ea4e6e07"
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+
+from rich.console import Console
+
+from wandbctl.utils.display import (
+    create_zombies_table,
+    format_bytes,
+    format_duration,
+    format_time_ago,
+)
+
+
+def test_format_duration():
+    assert format_duration(None) == "—"
+    assert format_duration(45) == "45s"
+    assert format_duration(300) == "5m"
+    assert format_duration(3660) == "1h 1m"
+
+
+def test_format_bytes():
+    assert format_bytes(512) == "512.0 B"
+    assert format_bytes(2048) == "2.0 KB"
+
+
+def test_format_time_ago_with_reference_time():
+    now = datetime(2024, 1, 10, 12, tzinfo=timezone.utc)
+    
+    assert format_time_ago(None, now) == "—"
+    assert format_time_ago(now - timedelta(seconds=30), now) == "30s ago"
+    assert format_time_ago(now - timedelta(minutes=5), now) == "5m ago"
+    assert format_time_ago(now - timedelta(hours=3), now) == "3h ago"
+    assert format_time_ago(datetime(2024, 1, 8, 12), now) == "2d ago"
+
+
+def test_create_zombies_table_reuses_confidence_labels():
+    now = datetime.now(timezone.utc)
+    zombies = [
+        {"id": f"run-{i:04d}", "project": "p", "runtime_seconds": 60, "updated_at": now, "confidence": confidence}
+        for i, confidence in enumerate(["high", "medium", "high"])
+    ]
+    
+    console = Console(width=120, force_terminal=False)
+    with console.capture() as capture:
+        console.print(create_zombies_table(zombies))
+    output = capture.get()
+    
+    assert output.count("HIGH") == 2
+    assert output.count("MEDIUM") == 1
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from wandbctl.utils.duration import parse_duration, parse_since
+
+
+def test_parse_duration_units():
+    assert parse_duration("24h") == timedelta(hours=24)
+    assert parse_duration("7D") == timedelta(days=7)
+    assert parse_duration("2w") == timedelta(weeks=2)
+    assert parse_duration("1m") == timedelta(days=30)
+
+
+def test_parse_duration_restricted_units():
+    assert parse_duration("7d", units="dw") == timedelta(days=7)
+    
+    with pytest.raises(ValueError, match="'7d', '1w'"):
+        parse_duration("24h", units="dw")
+
+
+def test_parse_duration_invalid():
+    with pytest.raises(ValueError):
+        parse_duration("seven days")
+
+
+def test_parse_since():
+    assert parse_since(None) is None
+    assert parse_since("") is None
+    
+    since = parse_since("1d")
+    expected = datetime.now(timezone.utc) - timedelta(days=1)
+    assert abs((since - expected).total_seconds()) < 5
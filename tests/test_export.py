@@ -0,0 +1,46 @@
+import io
+import json
+from datetime import datetime
+
+from wandbctl.commands.export import write_json_array, write_ndjson
+
+
+RECORDS = [
+    {"id": "r1", "created_at": datetime(2024, 1, 1), "config": {"lr": 0.1}},
+    {"id": "r2", "summary": {"loss": 0.5}},
+]
+
+
+def test_write_json_array():
+    out = io.BytesIO()
+    
+    count = write_json_array(out, iter(RECORDS))
+    
+    assert count == 2
+    assert json.loads(out.getvalue())[0]["created_at"] == "2024-01-01T00:00:00"
+
+
+def test_write_json_array_pretty_matches_indented_dump():
+    out = io.BytesIO()
+    
+    write_json_array(out, iter(RECORDS), pretty=True)
+    
+    expected = json.dumps(json.loads(out.getvalue()), indent=2)
+    assert out.getvalue().decode() == expected + "\n"
+
+
+def test_write_json_array_empty():
+    out = io.BytesIO()
+    
+    assert write_json_array(out, iter([])) == 0
+    assert json.loads(out.getvalue()) == []
+
+
+def test_write_ndjson():
+    out = io.BytesIO()
+    
+    count = write_ndjson(out, iter(RECORDS))
+    
+    lines = out.getvalue().splitlines()
+    assert count == 2
+    assert [json.loads(line)["id"] for line in lines] == ["r1", "r2"]
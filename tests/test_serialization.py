@@ -0,0 +1,53 @@
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+
+from wandbctl.utils.serialization import dumps, dumps_bytes, loads, raw_json
+
+
+def test_roundtrip():
+    data = {"lr": 0.001, "layers": [64, 128], "name": "résnet", "nested": {"a": None}}
+    
+    encoded = dumps(data)
+    
+    assert isinstance(encoded, str)
+    assert loads(encoded) == data
+    assert loads(encoded.encode()) == data
+
+
+def test_loads_accepts_stdlib_nan():
+    encoded = json.dumps({"loss": float("nan")})
+    
+    assert math.isnan(loads(encoded)["loss"])
+
+
+def test_dumps_bytes_serializes_datetimes():
+    data = {"created_at": datetime(2024, 1, 1, 12, 30), "path": Path("runs")}
+    
+    assert json.loads(dumps_bytes(data)) == {"created_at": "2024-01-01T12:30:00", "path": "runs"}
+    assert dumps_bytes(data, indent=True).startswith(b'{\n  "created_at"')
+
+
+def test_raw_json_embeds_serialized_text():
+    encoded = dumps_bytes({"config": raw_json('{"lr": 0.1}')})
+    
+    assert json.loads(encoded) == {"config": {"lr": 0.1}}
+
+
+def test_dumps_preserves_non_finite_floats():
+    data = {"loss": float("nan"), "metrics": [float("inf"), 1.0], "nested": {"min": float("-inf")}}
+    
+    encoded = dumps(data)
+    
+    assert encoded == json.dumps(data)
+    decoded = loads(encoded)
+    assert math.isnan(decoded["loss"])
+    assert decoded["metrics"] == [float("inf"), 1.0]
+    assert decoded["nested"]["min"] == float("-inf")
+
+
+def test_dumps_matches_stdlib_for_non_str_keys():
+    data = {1: "a", "b": None}
+    
+    assert dumps(data) == json.dumps(data)
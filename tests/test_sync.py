@@ -0,0 +1,27 @@
+from wandbctl.commands.sync import track_fetched
+
+
+class RecordingProgress:
+    
+    def __init__(self):
+        self.descriptions = []
+    
+    def update(self, task, description=None):
+        self.descriptions.append(description)
+
+
+def test_track_fetched_throttles_updates():
+    progress = RecordingProgress()
+    
+    runs = list(track_fetched(range(10_000), progress, task=0))
+    
+    assert runs == list(range(10_000))
+    assert len(progress.descriptions) < 100
+    assert progress.descriptions[-1] == "Fetched 10000 runs..."
+
+
+def test_track_fetched_empty():
+    progress = RecordingProgress()
+    
+    assert list(track_fetched([], progress, task=0)) == []
+    assert progress.descriptions == ["Fetched 0 runs..."]
@@ -30,3 +30,8 @@ def test_sparkline_mixed():
     result = get_sparkline([0, 5, 2, 8, 3])
     assert len(result) == 5
     assert result[3] == "█"
+
+
+def test_sparkline_scales_to_peak():
+    assert get_sparkline([0, 1, 2, 4, 8]) == " ▁▂▄█"
+    assert get_sparkline([1.5, 3.0]) == "▄█"
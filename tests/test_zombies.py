@@ -1,77 +1,137 @@
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta, timezone
 
 import pytest
-
-from wandbctl.commands.zombies import classify_zombie
+from click.testing import CliRunner
+
+from wandbctl.api import RunMetadata
+from wandbctl.commands import zombies as zombies_module
+from wandbctl.commands.zombies import classify_zombie, zombies
+
+
+CLASSIFY_CASES = (
+    (5, 3600, None, None),
+    (20, 3600, None, "medium"),
+    (35, 3600, None, "high"),
+    (20, 10800, 3000, "high"),
+)
+CLASSIFY_CASE_IDS = tuple(
+    f"m{minutes}-r{runtime}-a{avg}" for minutes, runtime, avg, _ in CLASSIFY_CASES
+)
+
+RUN_NO_UPDATE = {
+    "id": "test",
+    "entity": "e",
+    "project": "p",
+    "state": "running",
+    "runtime_seconds": 3600,
+    "updated_at": None,
+}
+
+
+@pytest.mark.parametrize(
+    "minutes_since_update,runtime,avg_runtime,expected_confidence",
+    CLASSIFY_CASES,
+    ids=CLASSIFY_CASE_IDS,
+)
+def test_classify_zombie(
+    make_running_run, now_utc, minutes_since_update, runtime, avg_runtime, expected_confidence
+):
+    run = make_running_run(runtime=runtime, minutes_since_update=minutes_since_update)
+    result = classify_zombie(run, threshold_minutes=15, avg_runtime=avg_runtime, now=now_utc)
+    
+    if expected_confidence is None:
+        assert result is None
+    else:
+        assert result is not None
+        assert result["confidence"] == expected_confidence
 
 
-def make_running_run(
-    id: str = "test-run",
-    runtime: int = 3600,
-    minutes_since_update: int = 5,
-) -> dict:
-    now = datetime.now(timezone.utc)
-    updated_at = now - timedelta(minutes=minutes_since_update)
+def test_zombie_preserves_run_info(make_running_run, now_utc):
+    run = make_running_run(id="my-run-123", minutes_since_update=20)
+    result = classify_zombie(run, threshold_minutes=15, avg_runtime=None, now=now_utc)
     
-    return {
-        "id": id,
-        "entity": "test-entity",
-        "project": "test-project",
-        "name": f"Run {id}",
-        "state": "running",
-        "runtime_seconds": runtime,
-        "updated_at": updated_at,
-    }
+    assert result["id"] == "my-run-123"
+    assert result["project"] == "test-project"
+    assert result["entity"] == "test-entity"
 
 
-def test_not_zombie_recent_update():
-    run = make_running_run(minutes_since_update=5)
-    result = classify_zombie(run, threshold_minutes=15, avg_runtime=None)
-    assert result is None
+def test_no_zombie_without_updated_at():
+    assert classify_zombie(RUN_NO_UPDATE, threshold_minutes=15, avg_runtime=None) is None
 
 
-def test_zombie_medium_confidence():
+def test_zombie_uses_supplied_now(make_running_run):
     run = make_running_run(minutes_since_update=20)
-    result = classify_zombie(run, threshold_minutes=15, avg_runtime=None)
+    now = run["updated_at"] + timedelta(minutes=5)
     
-    assert result is not None
-    assert result["confidence"] == "medium"
-
-
-def test_zombie_high_confidence_long_stall():
-    run = make_running_run(minutes_since_update=35)
-    result = classify_zombie(run, threshold_minutes=15, avg_runtime=None)
+    assert classify_zombie(run, threshold_minutes=15, avg_runtime=None, now=now) is None
     
-    assert result is not None
+    now = run["updated_at"] + timedelta(minutes=40)
+    result = classify_zombie(run, threshold_minutes=15, avg_runtime=None, now=now)
     assert result["confidence"] == "high"
+    assert result["reasons"] == ["no updates for 40m"]
 
 
-def test_zombie_high_confidence_runtime():
-    run = make_running_run(runtime=10800, minutes_since_update=20)
-    avg_runtime = 3000
-    result = classify_zombie(run, threshold_minutes=15, avg_runtime=avg_runtime)
+class RecordingCache:
     
-    assert result is not None
-    assert result["confidence"] == "high"
+    def __init__(self, *args, **kwargs):
+        self.avg_runtime_calls = 0
+        RecordingCache.instance = self
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return None
+    
+    def get_avg_finished_runtime(self, entity=None, project=None):
+        self.avg_runtime_calls += 1
+        return 3000
 
 
-def test_zombie_preserves_run_info():
-    run = make_running_run(id="my-run-123", minutes_since_update=20)
-    result = classify_zombie(run, threshold_minutes=15, avg_runtime=None)
+def fake_client(runs):
+    class FakeClient:
+        default_entity = "test-entity"
+        
+        def list_running_runs(self, entity=None, project=None):
+            return iter(runs)
     
-    assert result["id"] == "my-run-123"
-    assert result["project"] == "test-project"
-    assert result["entity"] == "test-entity"
+    return FakeClient
 
 
-def test_no_zombie_without_updated_at():
-    run = {
-        "id": "test",
-        "entity": "e",
-        "project": "p",
-        "state": "running",
-        "runtime_seconds": 3600,
-        "updated_at": None,
-    }
-    result = classify_zombie(run, threshold_minutes=15, avg_runtime=None)
-    assert result is None
+def running_meta(now, minutes_since_update, runtime=3600):
+    updated_at = now - timedelta(minutes=minutes_since_update)
+    return RunMetadata(
+        id=f"run-{minutes_since_update}",
+        entity="test-entity",
+        project="test-project",
+        name="run",
+        state="running",
+        created_at=updated_at,
+        updated_at=updated_at,
+        runtime_seconds=runtime,
+        config={},
+        summary={},
+        gpu_count=1,
+    )
+
+
+@pytest.mark.parametrize(
+    "minutes_since_update,expected_calls",
+    [
+        ([1, 2], 0),
+        ([1, 40], 1),
+    ],
+)
+def test_zombies_queries_average_only_for_stale_runs(
+    monkeypatch, minutes_since_update, expected_calls
+):
+    # The command reads the real clock, so the runs must be built from it too.
+    now = datetime.now(timezone.utc)
+    runs = [running_meta(now, m) for m in minutes_since_update]
+    monkeypatch.setattr(zombies_module, "WandbClient", fake_client(runs))
+    monkeypatch.setattr(zombies_module, "Cache", RecordingCache)
+    
+    result = CliRunner().invoke(zombies, [])
+    
+    assert result.exit_code == 0, result.output
+    assert RecordingCache.instance.avg_runtime_calls == expected_calls